@@ -16,13 +16,199 @@ Email: shoss008@ucr.edu
 # Required Libs
 
 import numpy as np
-from numpy.linalg import norm
 from os.path import expanduser
 from scipy.interpolate import InterpolatedUnivariateSpline
 from scipy.interpolate import PchipInterpolator
-from scipy.special import jv
-from accum import accum  # This package is used to compute the cumulative average
-import copy
+from scipy.interpolate import CubicSpline
+from scipy.special import j1
+from scipy.special import expit
+from numba import njit, prange
+from collections import namedtuple
+
+# Flattened k-point mesh kept as structure of arrays, see thermoelectricProperties._kmesh
+_kMesh = namedtuple('_kMesh', ['kx', 'ky', 'kz', 'mag', 'E', 'ko'])
+
+# Joyce Dixon expansion coefficients, precomputed once at import
+_JD_COEF_1 = 1 / np.sqrt(8)
+_JD_COEF_2 = 3. / 16 - np.sqrt(3) / 9
+
+
+def _group_mean(values, groups, numGroups):
+
+    # Mean of values over integer group labels (one sort plus a single C reduction pass),
+    # used to smooth mesh quantities over the duplicate energy levels returned by np.unique.
+    # The groups come from return_inverse, so every label in range(numGroups) is populated.
+    # values may carry leading batch dimensions; the labels address its last axis.
+
+    order = np.argsort(groups, kind='stable')
+    starts = np.searchsorted(groups[order], np.arange(numGroups))
+    sums = np.add.reduceat(np.take(values, order, axis=-1), starts, axis=-1)
+    counts = np.diff(np.append(starts, len(groups)))
+    return sums / counts
+
+
+class _EvenSpline:
+
+    """
+    Cubic spline resampled onto an even grid so evaluations locate their
+    interval by index arithmetic [O(1)] instead of the binary search done
+    inside the scipy spline objects. Meant for the uniform energyRange
+    lookups, where the bisection dominates the evaluation cost.
+    """
+
+    def __init__(self, x, y):
+
+        source = InterpolatedUnivariateSpline(x, y)
+        # Dense even resampling keeps the direct-index table close to the source spline
+        numPoints = 4 * len(x)
+        self.xo = x[0]
+        self.dx = (x[-1] - x[0]) / (numPoints - 1)
+        grid = self.xo + self.dx * np.arange(numPoints)
+        self.coef = CubicSpline(grid, source(grid)).c
+        self.numIntervals = numPoints - 1
+
+    def __call__(self, x):
+
+        x = np.asarray(x, dtype=float)
+        idx = np.clip(((x - self.xo) / self.dx).astype(np.int64), 0, self.numIntervals - 1)
+        dx = x - (self.xo + idx * self.dx)
+        c = self.coef
+        return ((c[0, idx] * dx + c[1, idx]) * dx + c[2, idx]) * dx + c[3, idx]
+
+
+@njit(parallel=True, fastmath=True)
+def _tau2D_cylinder_kernel(J, qr, cos_theta, ds, delE, t, coef):
+
+    # Fused integrand and trapezoidal sum over the ellipse parameter t for tau2D_cylinder,
+    # batched over the pore radii. Each energy point is independent, so the outer loop is
+    # parallel and the intermediates (SR, f) stay in registers instead of [nK, n]
+    # temporaries. The radius-independent weight (1-cos)/delE*ds is computed once per
+    # sample and shared across radii.
+
+    numRo, numE, n = J.shape
+    int_ = np.empty((numRo, numE))
+    for u in prange(numE):
+        acc = np.zeros(numRo)
+        f_prev = np.empty(numRo)
+        w = (1 - cos_theta[u, 0]) / delE[u, 0] * ds[u, 0]
+        for r in range(numRo):
+            f_prev[r] = coef[r] * (J[r, u, 0] / qr[u, 0])**2 * w
+        for k in range(1, n):
+            w = (1 - cos_theta[u, k]) / delE[u, k] * ds[u, k]
+            dt = t[k] - t[k-1]
+            for r in range(numRo):
+                f_k = coef[r] * (J[r, u, k] / qr[u, k])**2 * w
+                acc[r] += (f_prev[r] + f_k) / 2 * dt
+                f_prev[r] = f_k
+        for r in range(numRo):
+            int_[r, u] = acc[r]
+
+    return int_
+
+
+@njit(parallel=True, fastmath=True)
+def _fused_moments(Xt, Yt, Zt, E):
+
+    # The five transport moments of electricalProperties as one streaming trapezoid
+    # pass over the energy axis: each row is read once and the energy-weighted moments
+    # reuse the already-loaded Xt samples, instead of five np.trapz calls that each
+    # re-read their integrand and allocate a diff(E) array.
+
+    numRows, numE = Xt.shape
+    out = np.empty((5, numRows))
+    for row in prange(numRows):
+        i_x = 0.
+        i_y = 0.
+        i_z = 0.
+        i_xe = 0.
+        i_xe2 = 0.
+        for k in range(numE - 1):
+            dE = (E[k+1] - E[k]) / 2
+            i_x += (Xt[row, k] + Xt[row, k+1]) * dE
+            i_y += (Yt[row, k] + Yt[row, k+1]) * dE
+            i_z += (Zt[row, k] + Zt[row, k+1]) * dE
+            i_xe += (Xt[row, k] * E[k] + Xt[row, k+1] * E[k+1]) * dE
+            i_xe2 += (Xt[row, k] * E[k]**2 + Xt[row, k+1] * E[k+1]**2) * dE
+        out[0, row] = i_x
+        out[1, row] = i_y
+        out[2, row] = i_z
+        out[3, row] = i_xe
+        out[4, row] = i_xe2
+
+    return out
+
+
+@njit(parallel=True)
+def _tau3D_scatter_kernel(Qux, Quy, Quz, Cux, Cuy, Cuz, kx, ky, kz, mag,
+                          a_axes, b_axes, c_axes, ko0, ko1, ko2, meff0, meff1, meff2,
+                          ro, N_coef, four_pi_Uo, SR_coef, hBar2):
+
+    # The whole scattering loop of tau3D_spherical: parallel over the k points, with
+    # scalar inner loops over the mesh elements and radii so no [numTri]-sized
+    # temporaries are allocated. Each energy surface is the componentwise affine image
+    # of the shared unit-sphere mesh, built on the fly from the centroid and
+    # cross-product components. No fastmath here: the degenerate zero-energy surface
+    # legitimately produces non-finite entries that must propagate as IEEE says.
+
+    numE = kx.shape[0]
+    numRo = ro.shape[0]
+    numTri = Qux.shape[0]
+    out = np.empty((numRo, numE))
+    for u in prange(numE):
+        sx = -a_axes[u]
+        sy = -b_axes[u]
+        sz = c_axes[u]
+        csx = sy * sz
+        csy = sx * sz
+        csz = sx * sy
+        acc = np.zeros(numRo)
+        for i in range(numTri):
+            Qx = sx * Qux[i] + ko0
+            Qy = sy * Quy[i] + ko1
+            Qz = sz * Quz[i] + ko2
+            A = 0.5 * np.sqrt((csx * Cux[i])**2 + (csy * Cuy[i])**2 + (csz * Cuz[i])**2)
+            qx = kx[u] - Qx
+            qy = ky[u] - Qy
+            qz = kz[u] - Qz
+            q = np.sqrt(qx * qx + qy * qy + qz * qz)
+            cos_t = (kx[u] * Qx + ky[u] * Qy + kz[u] * Qz) / mag[u] / np.sqrt(Qx * Qx + Qy * Qy + Qz * Qz)
+            delE_i = abs(hBar2 * ((Qx - ko0) / meff0 + (Qy - ko1) / meff1 + (Qz - ko2) / meff2))
+            w = (1 - cos_t) / delE_i * A
+            inv_q = 1.0 / q
+            inv_q2 = inv_q * inv_q
+            for r in range(numRo):
+                M = four_pi_Uo * (np.sin(ro[r] * q) * inv_q - ro[r] * np.cos(ro[r] * q)) * inv_q2
+                acc[r] += SR_coef * M * M * w
+        for r in range(numRo):
+            out[r, u] = N_coef[r] * acc[r]
+
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _tau3D_mesh_block(V0, V1, V2, Qx, Qy, Qz, Cx, Cy, Cz):
+
+    # Centroids and edge cross products for one triangle family of the tau3D_spherical
+    # surface mesh, written element by element in scalar arithmetic straight into the
+    # family's slice of the component arrays, so no [numTri, 3] temporaries are
+    # allocated for the edges and no concatenate pass is needed afterwards.
+
+    for k in prange(V0.shape[0]):
+        x0 = V0[k, 0]
+        y0 = V0[k, 1]
+        z0 = V0[k, 2]
+        e1x = V1[k, 0] - x0
+        e1y = V1[k, 1] - y0
+        e1z = V1[k, 2] - z0
+        e2x = V2[k, 0] - x0
+        e2y = V2[k, 1] - y0
+        e2z = V2[k, 2] - z0
+        Qx[k] = (x0 + V1[k, 0] + V2[k, 0]) / 3
+        Qy[k] = (y0 + V1[k, 1] + V2[k, 1]) / 3
+        Qz[k] = (z0 + V1[k, 2] + V2[k, 2]) / 3
+        Cx[k] = e1y * e2z - e1z * e2y
+        Cy[k] = e1z * e2x - e1x * e2z
+        Cz[k] = e1x * e2y - e1y * e2x
 
 
 class thermoelectricProperties:
@@ -50,6 +236,14 @@ class thermoelectricProperties:
         self.numBands = numBands
         self.electronDispersian = electronDispersian
         self.numQpoints = numQpoints
+        self._kmesh_cache = {}                                  # Shared k-point meshes keyed on (nk, valley, dk_len, meff)
+
+        # Trapezoid quadrature weights for the uniform energyRange grid, so the occupation
+        # integrals reduce to a single BLAS dot product instead of np.trapz's generic path
+        self._trapzWeights = np.full(numEnergySampling, (energyMax - energyMin) / (numEnergySampling - 1))
+        self._trapzWeights[[0, -1]] *= 0.5
+
+        self._defaultTemp = np.expand_dims(np.arange(300, 1301, 100), axis=0)   # Memoized default temperature sampling
 
     def energyRange(self):                                      # Create an 2D array of energy space sampling
 
@@ -63,6 +257,8 @@ class thermoelectricProperties:
 
     def temp(self, TempMin=300, TempMax=1301, dT=100):          # Create an 2D array of temperature sampling
 
+        if (TempMin, TempMax, dT) == (300, 1301, 100):          # Default range is memoized, see __init__
+            return self._defaultTemp
         temperature = np.arange(TempMin, TempMax, dT)           # Temperature
         return np.expand_dims(temperature, axis=0)              # The array size is [1,(TempMax-TempMin)/dT]
 
@@ -90,7 +286,7 @@ class thermoelectricProperties:
 
     def analyticalDoS(self, energyRange, alpha):                # See the manual fot the eqution
                 
-         """
+        """
         This function approximate the electron density of state for parabolic and nonparabolic bands.
         This function is of interest in case DFT calculation is not available
         See manual for the detail.
@@ -194,14 +390,14 @@ class thermoelectricProperties:
         if Nc is None:
             Nc = Ao * Temp**(3. / 2)
 
-        JD_CC = np.log(np.divide(carrierConcentration, Nc)) + 1 / np.sqrt(8) * np.divide(carrierConcentration, Nc) - \
-                (3. / 16 - np.sqrt(3) / 9) * np.power(np.divide(carrierConcentration, Nc), 2)           
+        r = np.divide(carrierConcentration, Nc)                 # Reduced carrier concentration, computed once
+        JD_CC = np.log(r) + _JD_COEF_1 * r - _JD_COEF_2 * r * r
 
-        fermiLevelEnergy = thermoelectricProperties.kB * np.multiply(T, JD_CC)          # Joice Dixon approximation of Ef
+        fermiLevelEnergy = thermoelectricProperties.kB * np.multiply(T, JD_CC, out=JD_CC)       # Joice Dixon approximation of Ef
 
         f, _ = self.fermiDistribution(energyRange=energyRange, fermiLevel=fermiLevelEnergy, Temp=T)     # Fermi distribution
 
-        n = np.trapz(np.multiply(DoS, f), energyRange, axis=1)          # Carrier concentraion
+        n = np.multiply(DoS, f) @ self._trapzWeights            # Carrier concentraion
 
         return [fermiLevelEnergy,np.expand_dims(n,axis=0)] # The list size is [2, size(temp)]
 
@@ -214,11 +410,11 @@ class thermoelectricProperties:
         else:
             T = Temp
 
-        xi = np.exp((energyRange-fermiLevel.T)/T.T/thermoelectricProperties.kB)
+        kBT = T.T*thermoelectricProperties.kB
 
-        fermiDirac = 1/(xi+1)   # Fermi distribution
-        dfdE = -1*xi/(1+xi)**2/T.T/thermoelectricProperties.kB  # Fermi window
-        fermi = np.array([fermiDirac, dfdE])
+        fermiDirac = expit(-(energyRange-fermiLevel.T)/kBT)     # Fermi distribution, 1/(exp(x)+1) without the overflowing exp
+        dfdE = -fermiDirac*(1-fermiDirac)/kBT                   # Fermi window
+        fermi = np.stack([fermiDirac, dfdE])
 
         return fermi  # The array size is [2, size(temp)], The first row is the Fermi and the second row is the derivative(Fermi window)
 
@@ -229,18 +425,23 @@ class thermoelectricProperties:
         with open(expanduser(path2eigenval)) as eigenvalFile:
             for _ in range(skipLines):
                 next(eigenvalFile)
-            block = [[float(_) for _ in line.split()] for line in eigenvalFile]
-        eigenvalFile.close()
+            # Tokenize the remainder in one C-level pass, the per-line float() loop is pure interpreter work
+            block = np.array(eigenvalFile.read().split(), dtype=np.float64)
 
-        electronDispersian = [range(1, self.numBands + 1)]  # First line is atoms id
+        # Each kpoint block is one 4-token kpoint line followed by numBands band lines
+        # (band id, energy and optionally the occupations), blank separator lines vanish
+        # in the tokenization
+        numCols = (len(block) // self.numKpoints - 4) // self.numBands
+        block = block.reshape(self.numKpoints, 4 + self.numBands * numCols)
 
-        kpoints = np.asarray(block[1::self.numBands + 2])[:, 0:3]
+        kpoints = block[:, 0:3]
 
-        for _ in range(self.numKpoints):
-            binary2Darray = []
-            for __ in range(self.numBands):
-                binary2Darray = np.append(binary2Darray, block[__ + 2 + (self.numBands + 2) * _][1])
-            electronDispersian = np.vstack([electronDispersian, binary2Darray]) # Energy levels
+        # The dispersian is one preallocated float block: row 0 carries the band ids
+        # (what used to be a Python range row) and rows 1..numKpoints the energy levels,
+        # so no dtype promotion or row-wise resizing happens while filling it.
+        electronDispersian = np.empty((self.numKpoints + 1, self.numBands))
+        electronDispersian[0] = np.arange(1, self.numBands + 1)         # Band ids
+        electronDispersian[1:] = block[:, 5::numCols]                   # Energy levels
 
         dispersian = [kpoints, electronDispersian]
 
@@ -253,14 +454,14 @@ class thermoelectricProperties:
 
         DoS = np.loadtxt(expanduser(path2DoS), delimiter=None, skiprows=headerLines, max_rows=numDoSpoints)
         valleyPointEnergy = DoS[valleyPoint, 0]
-        DoSSpline = InterpolatedUnivariateSpline(DoS[valleyPoint:, 0] - valleyPointEnergy, \
-                                                 DoS[valleyPoint:, 1] / unitcell_volume)
+        DoSSpline = _EvenSpline(DoS[valleyPoint:, 0] - valleyPointEnergy, \
+                                DoS[valleyPoint:, 1] / unitcell_volume)
 
         DoSFunctionEnergy = DoSSpline(energyRange)  # Density of state
 
         return DoSFunctionEnergy  # The array size is [1, numEnergySampling]
 
-    def fermiLevelSelfConsistent(self, carrierConcentration, Temp, energyRange, DoS, fermilevel):
+    def fermiLevelSelfConsistent(self, carrierConcentration, Temp, energyRange, DoS, fermilevel, dtype=np.float64):
                 
         """
         A tool for self-consistent calculation of the Fermi level from a given carrier concentration ...
@@ -286,38 +487,39 @@ class thermoelectricProperties:
         """ 
 
         # Joyce Dixon approx. is a good initial point for degenerate semiconductors.
-        
-        fermi = np.linspace(fermilevel[0]-0.4, fermilevel[0]+0.2, 4000, endpoint=True).T  # Range of energy arounf Ef(JD )to consider
-        
 
-        result_array = np.empty((np.shape(Temp)[1], np.shape(fermi)[1]))
-        idx_j = 0
-        for j in Temp[0]:
-            idx_i = 0
-            for i in fermi[idx_j]:
-                f, _ = self.fermiDistribution(energyRange=energyRange,
-                                              fermiLevel=np.expand_dims(np.array([i]), axis=0),
-                                              Temp=np.expand_dims(np.array([j]), axis=0))
-                tmp = np.trapz(np.multiply(DoS, f), energyRange, axis=1)
-                result_array[idx_j, idx_i] = tmp
-                idx_i += 1
-            idx_j += 1
-
-        diff = np.tile(np.transpose(carrierConcentration), (1, np.shape(fermi)[1])) - abs(result_array) 
+        # The trial-grid spacing is temperature independent, so one shared offset vector
+        # broadcast against the Joyce Dixon levels replaces the per-temperature linspace
+        offset = np.linspace(-0.4, 0.2, 4000, endpoint=True)
+        fermi = fermilevel[0][:, None] + offset[None, :]        # Range of energy arounf Ef(JD) to consider
+
+
+        # The (temperature, trial Fermi level) grid is evaluated in one broadcast instead of
+        # a double Python loop. The Fermi level axis is chunked to bound the size of the
+        # [numTemp, chunk, numEnergySampling] intermediate.
+        # The grid search tolerates float32 (pass dtype=np.float32 to halve the bandwidth of
+        # the [numTemp, chunk, numEnergySampling] intermediate); the selected Ef stays float64
+        result_array = np.empty((np.shape(Temp)[1], np.shape(fermi)[1]), dtype=dtype)
+        kB_T = (thermoelectricProperties.kB * Temp[0])[:, None, None].astype(dtype, copy=False)
+        fermi_grid = fermi.astype(dtype, copy=False)
+        E_row = energyRange[0].astype(dtype, copy=False)
+        DoS_row = DoS[0].astype(dtype, copy=False)
+        weights = self._trapzWeights.astype(dtype, copy=False)
+
+        blockSize = 256
+        for idx in np.arange(0, np.shape(fermi)[1], blockSize):
+            f = expit((fermi_grid[:, idx:idx+blockSize, None] - E_row[None, None, :]) / kB_T)   # Fermi distribution on the grid
+            result_array[:, idx:idx+blockSize] = (DoS_row[None, None, :] * f) @ weights
+
+        diff = np.tile(np.transpose(carrierConcentration), (1, np.shape(fermi)[1])) - abs(result_array)
 
         min_idx = np.argmin(np.abs(diff), axis=1)
         print("Fermi Level Self Consistent Index ",min_idx)
         # This print the index if it reaches the extreme index (0) or (4000), increase the energy range.
 
-        Ef = np.empty((1, np.shape(Temp)[1]))
+        Ef = np.take_along_axis(fermi, min_idx[:, None], axis=1).T
 
-        for Ef_idx in np.arange(len(min_idx)):
-            Ef[0,Ef_idx] = fermi[Ef_idx,min_idx[Ef_idx]]
-        elm = 0
-        n = np.empty((1, np.shape(Temp)[1]))
-        for idx in min_idx:
-            n[0,elm] = result_array[elm, idx]
-            elm += 1
+        n = np.take_along_axis(result_array, min_idx[:, None], axis=1).T
 
         return [Ef,n] # The array size is [2, size(temp)], The first row is the Fermi and the second row is the carrier concentration
 
@@ -333,7 +535,7 @@ class thermoelectricProperties:
         dEdk[0] = (energy_kp[1] - energy_kp[0]) / (kp[1] - kp[0])
         dEdk[-1] = (energy_kp[-1] - energy_kp[-2]) / (kp[-1] - kp[-2])
 
-        dEdkSpline = InterpolatedUnivariateSpline(energy_kp, np.array(dEdk))
+        dEdkSpline = _EvenSpline(energy_kp, np.array(dEdk))
         dEdkFunctionEnergy = dEdkSpline(energyRange)
 
         groupVel = dEdkFunctionEnergy / thermoelectricProperties.hBar
@@ -341,39 +543,69 @@ class thermoelectricProperties:
         return groupVel
         
 
-    def analyticalGroupVelocity(self,energyRange, nk, m, valley, dk_len, alpha):
+    def _kmesh(self, nk, valley, dk_len, meff):
 
         """
-        If no DFT calculation is availble this function approximate the group velocity near the conduction band edge.
-        This works well up to few hundreds of mev.
+        Build the flattened k-point mesh shared by analyticalGroupVelocity, tau2D_cylinder
+        and tau3D_spherical, or fetch it from the cache when the same valley has been
+        sampled before. The components are kept as separate contiguous arrays (structure
+        of arrays) so the elementwise kernels downstream read unit-stride memory.
         """
 
-        meff = np.array(m)
+        key = (tuple(nk), tuple(valley), dk_len, tuple(meff))
+        if key in self._kmesh_cache:
+            return self._kmesh_cache[key]
+
         ko = 2 * np.pi / self.latticeParameter * np.array(valley)
         del_k = 2*np.pi/self.latticeParameter * dk_len * np.array([1, 1, 1])
+
         kx = np.linspace(ko[0], ko[0] + del_k[0], nk[0], endpoint=True)  # kpoints mesh
         ky = np.linspace(ko[1], ko[1] + del_k[1], nk[1], endpoint=True)  # kpoints mesh
         kz = np.linspace(ko[2], ko[2] + del_k[2], nk[2], endpoint=True)  # kpoints mesh
-        [xk, yk, zk] = np.meshgrid(kx, ky, kz)
-        xk_ = np.reshape(xk, -1)
-        yk_ = np.reshape(yk, -1)
-        zk_ = np.reshape(zk, -1)
 
-        kpoint = np.array([xk_, yk_, zk_])
-        mag_kpoint = norm(kpoint, axis=0)
+        # Broadcast the three 1-D axes instead of materializing meshgrid cubes: E and |k|
+        # are accumulated from per-axis vectors and only the flattened output arrays are
+        # allocated. The flattening order matches the former meshgrid layout.
+        shape = (nk[1], nk[0], nk[2])
+        kpoint_x = np.broadcast_to(kx[None, :, None], shape).reshape(-1)
+        kpoint_y = np.broadcast_to(ky[:, None, None], shape).reshape(-1)
+        kpoint_z = np.broadcast_to(kz[None, None, :], shape).reshape(-1)
 
-        mc = 3/(1/meff[0]+1/meff[1]+1/meff[2])  # Conduction band effective mass
+        mag_kpoint = np.sqrt((kx**2)[None, :, None] + (ky**2)[:, None, None] +
+                             (kz**2)[None, None, :]).reshape(-1)
 
+        dkx2 = (kx - ko[0])**2 / meff[0]
+        dky2 = (ky - ko[1])**2 / meff[1]
+        dkz2 = (kz - ko[2])**2 / meff[2]
         E = thermoelectricProperties.hBar**2 / 2 * \
-        ((kpoint[0] - ko[0])**2 / meff[0] + (kpoint[1] - ko[1])**2 / meff[1] + (kpoint[2] - ko[2]) ** 2 / meff[2]) \
-        * thermoelectricProperties.e2C          # Ellipsoidal energy band shape
-        
-        vel = thermoelectricProperties.hBar*np.sqrt((kpoint[0]-ko[0])**2+(kpoint[1]-ko[1])**2
-                                                    +(kpoint[2]-ko[2])**2)/mc/(1+2*alpha*E)*thermoelectricProperties.e2C
+        (dkx2[None, :, None] + dky2[:, None, None] + dkz2[None, None, :]).reshape(-1) \
+        * thermoelectricProperties.e2C                                   # Energy levels in ellipsoidal band structure
+
+        mesh = _kMesh(kx=kpoint_x, ky=kpoint_y, kz=kpoint_z, mag=mag_kpoint, E=E, ko=ko)
+        self._kmesh_cache[key] = mesh
+
+        return mesh
+
+    def analyticalGroupVelocity(self,energyRange, nk, m, valley, dk_len, alpha):
+
+        """
+        If no DFT calculation is availble this function approximate the group velocity near the conduction band edge.
+        This works well up to few hundreds of mev.
+        """
+
+        meff = np.array(m)
+        mesh = self._kmesh(nk, valley, dk_len, meff)
+        ko = mesh.ko
+        E = mesh.E
+
+        mc = 3/(1/meff[0]+1/meff[1]+1/meff[2])  # Conduction band effective mass
+
+        vel = thermoelectricProperties.hBar*np.sqrt((mesh.kx-ko[0])**2+(mesh.ky-ko[1])**2
+                                                    +(mesh.kz-ko[2])**2)/mc/(1+2*alpha*E)*thermoelectricProperties.e2C
 
         Ec, indices, return_indices = np.unique(E, return_index=True, return_inverse=True) # Smooth data
 
-        vg = accum(return_indices, vel, func=np.mean, dtype=float)
+        vg = _group_mean(vel, return_indices, len(Ec))  # Mean group velocity per unique energy level
 
         ESpline = PchipInterpolator(Ec, vg)
         velFunctionEnergy = ESpline(energyRange)
@@ -392,13 +624,15 @@ class thermoelectricProperties:
         # Electron-phonon scattering rate using Ravich model
         # See the manual for the reference
 
-        nonparabolic_term = (1-((alpha.T*energyRange)/(1+2*alpha.T*energyRange)*(1-Dv/DA)))**2 \
-        -8/3*(alpha.T*energyRange)*(1+alpha.T*energyRange)/(1+2*alpha.T*energyRange)**2*(Dv/DA) # Nonparabolic term in Ravich model
+        aE = alpha.T*energyRange                # Computed once, the expression below used to rebuild it four times
+        tmp = 1+2*aE
+        nonparabolic_term = (1-(aE/tmp*(1-Dv/DA)))**2 \
+        -8/3*aE*(1+aE)/tmp**2*(Dv/DA)           # Nonparabolic term in Ravich model
 
         tau = rho*vs**2*thermoelectricProperties.hBar \
         /np.pi/thermoelectricProperties.kB/T.T/DA/DA*1e9/thermoelectricProperties.e2C/D         # Lifetime for parabolic band
 
-        tau_p = tau/nonparabolic_term # Lifetime in nonparabolic band
+        tau_p = np.divide(tau, nonparabolic_term, out=nonparabolic_term) # Lifetime in nonparabolic band
 
         return [tau,tau_p] # The first row does not count for nonparabolicity, the second row does
 
@@ -425,13 +659,16 @@ class thermoelectricProperties:
 
         g = 8*m_c.T*LD.T**2*energyRange/thermoelectricProperties.hBar**2/thermoelectricProperties.e2C   # Gamma term
 
-        var_tmp = np.log(1+g)-g/(1+g)   # tmp var.
+        var_tmp = 1+g                   # tmp var., buffer reused for both terms
+        log_tmp = np.log1p(g)           # accurate for the small-g tail, no 1+g round-off
+        np.divide(g, var_tmp, out=var_tmp)
+        np.subtract(log_tmp, var_tmp, out=var_tmp)      # log(1+g)-g/(1+g)
 
-        tau = 16*np.pi*np.sqrt(2*m_c.T)*(4*np.pi*self.dielectric*thermoelectricProperties.e0)**2 \
-        /N.T/var_tmp*energyRange**(3/2)/thermoelectricProperties.e2C**(5/2)     # Brook-Herring model for electron-impurity scattering
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau = 16*np.pi*np.sqrt(2*m_c.T)*(4*np.pi*self.dielectric*thermoelectricProperties.e0)**2 \
+            /N.T/var_tmp*energyRange**(3/2)/thermoelectricProperties.e2C**(5/2)     # Brook-Herring model for electron-impurity scattering
 
-        where_are_NaNs = np.isnan(tau)
-        tau[where_are_NaNs] = 0
+        tau[np.isnan(tau)] = 0
 
         return tau  # The array size is [1, numEnergySampling]
 
@@ -441,13 +678,14 @@ class thermoelectricProperties:
 
         g = 4*np.pi*(4*np.pi*self.dielectric*thermoelectricProperties.e0)*energyRange/N.T**(1/3)/thermoelectricProperties.e2C   # Gamma term
 
-        var_tmp = np.log(1+g**2)   # tmp var.
-        
-        tau = 16*np.pi*np.sqrt(2*m_c.T)*(4*np.pi*self.dielectric*thermoelectricProperties.e0)**2 \
-        /N.T/var_tmp*energyRange**(3/2)/thermoelectricProperties.e2C**(5/2)     # Electron-impurity scattering model fpr shallow doping
+        np.multiply(g, g, out=g)
+        var_tmp = np.log1p(g, out=g)    # log(1+g**2), reusing the gamma buffer
 
-        where_are_NaNs = np.isnan(tau)
-        tau[where_are_NaNs] = 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau = 16*np.pi*np.sqrt(2*m_c.T)*(4*np.pi*self.dielectric*thermoelectricProperties.e0)**2 \
+            /N.T/var_tmp*energyRange**(3/2)/thermoelectricProperties.e2C**(5/2)     # Electron-impurity scattering model fpr shallow doping
+
+        tau[np.isnan(tau)] = 0
 
         return tau  # The array size is [1, numEnergySampling]
 
@@ -459,7 +697,7 @@ class thermoelectricProperties:
 
         return tau  # The array size is [1, numEnergySampling]
 
-    def tau2D_cylinder(self,energyRange, nk, Uo, m, vfrac, valley, dk_len, ro, n=2000):
+    def tau2D_cylinder(self,energyRange, nk, Uo, m, vfrac, valley, dk_len, ro, n=2000, dtype=np.float64):
 
         """
         This is a fast algorithm that uses Fermi’s golden rule to compute the energy dependent electron scattering rate
@@ -468,25 +706,14 @@ class thermoelectricProperties:
         See manual for the detail
         """
 
-        meff = np.array(m) * thermoelectricProperties.men                # Electron conduction nband effective mass
-        ko = 2 * np.pi / self.latticeParameter * np.array(valley)
-        del_k = 2*np.pi/self.latticeParameter * dk_len * np.array([1, 1, 1])
+        meff = np.array(m) * thermoelectricProperties.me                # Electron conduction nband effective mass
         N = vfrac/np.pi/ro**2           # volume fraction/ porosity
 
-        kx = np.linspace(ko[0], ko[0] + del_k[0], nk[0], endpoint=True)  # kpoints mesh
-        ky = np.linspace(ko[1], ko[1] + del_k[1], nk[1], endpoint=True)  # kpoints mesh
-        kz = np.linspace(ko[2], ko[2] + del_k[2], nk[2], endpoint=True)  # kpoints mesh
-        [xk, yk, zk] = np.meshgrid(kx, ky, kz)
-        xk_ = np.reshape(xk, -1)
-        yk_ = np.reshape(yk, -1)
-        zk_ = np.reshape(zk, -1)
-        kpoint = np.array([xk_, yk_, zk_]) # Kpoint mesh sampling
-        mag_kpoint = norm(kpoint, axis=0)
+        mesh = self._kmesh(nk, valley, dk_len, meff)    # Kpoint mesh sampling
+        ko = mesh.ko
+        mag_kpoint = mesh.mag
+        E = mesh.E
 
-        E = thermoelectricProperties.hBar**2 / 2 * \
-        ((kpoint[0, :] - ko[0])**2 / meff[0] + (kpoint[1, :] - ko[1])**2 / meff[1] +
-         (kpoint[2, :] - ko[2]) ** 2 / meff[2]) * thermoelectricProperties.e2C  # Energy levels in ellipsoidal band structure
-        
         # Write the ellips shape in parametric form
 
         t = np.linspace(0, 2*np.pi, n)
@@ -497,38 +724,41 @@ class thermoelectricProperties:
 
         ds = np.sqrt((a.T * np.sin(t))**2 + (b.T * np.cos(t))**2)
 
-        cos_theta = ((a * kpoint[0]).T * np.cos(t) + (b * kpoint[1]).T * np.sin(t) +
-                     np.expand_dims(kpoint[2]**2, axis=1)) / \
+        cos_theta = ((a * mesh.kx).T * np.cos(t) + (b * mesh.ky).T * np.sin(t) +
+                     np.expand_dims(mesh.kz**2, axis=1)) / \
         np.sqrt(a.T**2 * np.cos(t)**2 + b.T**2 * np.sin(t)**2 +
-                np.expand_dims(kpoint[2]**2, axis=1)) / np.expand_dims(mag_kpoint, axis=1)
+                np.expand_dims(mesh.kz**2, axis=1)) / np.expand_dims(mag_kpoint, axis=1)
 
         delE = thermoelectricProperties.hBar**2 * \
         np.abs((a.T * np.cos(t) - ko[0]) / meff[0] +
-               (b.T * np.sin(t) - ko[1]) / meff[1] + (np.expand_dims(kpoint[2]**2, axis=1) - ko[2] / meff[2])) # Energy increment
-        
+               (b.T * np.sin(t) - ko[1]) / meff[1] + (np.expand_dims(mesh.kz**2, axis=1) - ko[2] / meff[2])) # Energy increment
+
         # qpints
-        qx = np.expand_dims(kpoint[0], axis=1) - a.T * np.cos(t)
-        qy = np.expand_dims(kpoint[1], axis=1) - b.T * np.sin(t)
+        qx = np.expand_dims(mesh.kx, axis=1) - a.T * np.cos(t)
+        qy = np.expand_dims(mesh.ky, axis=1) - b.T * np.sin(t)
         qr = np.sqrt(qx**2 + qy**2)
 
-        tau = np.empty((len(ro), len(E)))
+        # With dtype=np.float32 the [numRo, numKpoints, n] integrand arrays take half the
+        # bandwidth; the accumulated lifetimes and the spline output stay float64
+        t = t.astype(dtype, copy=False)
+        ds = ds.astype(dtype, copy=False)
+        cos_theta = cos_theta.astype(dtype, copy=False)
+        delE = delE.astype(dtype, copy=False)
+        qr = qr.astype(dtype, copy=False)
 
-        for r_idx in np.arange(len(ro)):
-            J = jv(1, ro[r_idx] * qr)           # Bessel func.
-            SR = 2 * np.pi / thermoelectricProperties.hBar * Uo**2 * (2 * np.pi)**3 * (ro[r_idx] * J / qr)**2   # Scattering rate
-            f = SR * (1 - cos_theta) / delE * ds
-            int_ = np.trapz(f, t, axis=1)
-            tau[r_idx] = 1 / (N[r_idx] / (2 * np.pi)**3 * int_) * thermoelectricProperties.e2C
+        J = j1(ro.astype(dtype)[:, None, None] * qr)    # Bessel func. for all radii in one vectorized call
+        # Scattering-rate prefactors, the rest of the integrand is fused in the jitted kernel
+        coef = 2 * np.pi / thermoelectricProperties.hBar * Uo**2 * (2 * np.pi)**3 * ro**2
+        int_ = _tau2D_cylinder_kernel(J, qr, cos_theta, ds, delE, t, coef)
+        tau = 1 / (N[:, None] / (2 * np.pi)**3 * int_) * thermoelectricProperties.e2C
 
         Ec, indices, return_indices = np.unique(E, return_index=True, return_inverse=True)
 
-        tau_c = np.empty((len(ro), len(indices)))
-
         tauFunctionEnergy = np.empty((len(ro), len(energyRange[0])))
 
-        for r_idx in np.arange(len(ro)):
-            tau_c[r_idx] = accum(return_indices, tau[r_idx], func=np.mean, dtype=float)
-        
+        tau_c = _group_mean(tau, return_indices, len(indices))  # Mean lifetime per unique energy level, all radii at once
+
+
         # Map lifetime to desired energy range
         for tau_idx in np.arange(len(tau_c)):
             ESpline = PchipInterpolator(Ec[30:], tau_c[tau_idx,30:])
@@ -536,7 +766,7 @@ class thermoelectricProperties:
 
         return tauFunctionEnergy
 
-    def tau3D_spherical(self,energyRange, nk, Uo, m, vfrac, valley, dk_len, ro, n=32):
+    def tau3D_spherical(self,energyRange, nk, Uo, m, vfrac, valley, dk_len, ro, n=32, dtype=np.float64):
 
         """
         This is a fast algorithm that uses Fermi’s golden rule to compute the energy dependent electron scattering rate
@@ -546,29 +776,13 @@ class thermoelectricProperties:
         """
 
         meff = np.array(m) * thermoelectricProperties.me                # Electron conduction nband effective mass
-        ko = 2 * np.pi / self.latticeParameter * np.array(valley)
-        del_k = 2*np.pi/self.latticeParameter * dk_len * np.array([1, 1, 1])
 
         N = 3*vfrac/4/np.pi/ro**3                                       # volume fraction/ porosity
 
-        kx = np.linspace(ko[0], ko[0] + del_k[0], nk[0], endpoint=True)  # kpoints mesh
-        ky = np.linspace(ko[1], ko[1] + del_k[1], nk[1], endpoint=True)  # kpoints mesh
-        kz = np.linspace(ko[2], ko[2] + del_k[2], nk[2], endpoint=True)  # kpoints mesh
-        [xk, yk, zk] = np.meshgrid(kx, ky, kz)
-        xk_ = np.reshape(xk, -1)
-        yk_ = np.reshape(yk, -1)
-        zk_ = np.reshape(zk, -1)
-
-        kpoint = np.array([xk_, yk_, zk_])                              # Kpoint mesh sampling
-        mag_kpoint = norm(kpoint, axis=0)
-
-        # Energy levels in ellipsoidal band structure
-        E = thermoelectricProperties.hBar**2 / 2 * \
-        ((kpoint[0, :] - ko[0])**2 / meff[0] +
-         (kpoint[1, :] - ko[1])**2 / meff[1] +
-         (kpoint[2, :] - ko[2]) ** 2 / meff[2]) * thermoelectricProperties.e2C
-
-        scattering_rate = np.zeros((len(ro), len(E)))
+        mesh = self._kmesh(nk, valley, dk_len, meff)                    # Kpoint mesh sampling
+        ko = mesh.ko
+        mag_kpoint = mesh.mag
+        E = mesh.E
 
         nu = np.linspace(0, np.pi, n)
         z_ = -1 * np.cos(nu)
@@ -578,92 +792,81 @@ class thermoelectricProperties:
 
         x_ = r * np.cos(theta)
         y_ = r * np.sin(theta)
-        
-        # Mesh energy ellipsiod in triangular elements
-
-        for u in np.arange(len(E)):
-
-            Q = np.zeros((2 * (n-2) * (n - 1), 3))
-            A = np.zeros((2 * (n-2) * (n - 1), 1))
-            k = 0
-            a_axis = np.sqrt(2 / (thermoelectricProperties.hBar**2 * thermoelectricProperties.e2C) * meff[0] * E[u])
-            b_axis = np.sqrt(2 / (thermoelectricProperties.hBar**2 * thermoelectricProperties.e2C) * meff[1] * E[u])
-            c_axis = np.sqrt(2 / (thermoelectricProperties.hBar**2 * thermoelectricProperties.e2C) * meff[2] * E[u])
-
-            y = -1 * b_axis * y_ + ko[1]
-            x = -1 * a_axis * x_ + ko[0]
-            Z_ = c_axis * z_ + ko[2]
-            z = np.tile(Z_[:, None], (1,n))
-            for j in np.arange(1,n-1):
-                for i in np.arange(2,n):
-                    S = np.array(np.array([x[i, j], y[i, j], z[i, j]]) +
-                                 np.array([x[i-1, j], y[i-1, j], z[i-1, j]]) +
-                                 np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]]))
-                    Q[k] = S/3
-                    a = norm(np.array([x[i, j], y[i, j], z[i, j]])-np.array([x[i-1, j], y[i-1, j], z[i-1, j]]))
-                    b = norm(np.array([x[i-1, j], y[i-1, j], z[i-1, j]])-np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]]))
-                    c = norm(np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]])-np.array([x[i, j], y[i, j], z[i, j]]))
-                    s = a+b+c
-                    s = s/2
-                    A[k] = np.sqrt(s*(s-a)*(s-b)*(s-c))         # surface area of the triangular mesh elements
-                    k += 1
-            for j in np.arange(1,n-1):
-                for i in np.arange(1,n-1):
-                    S = np.array([x[i, j-1], y[i, j-1], z[i, j-1]]) + \
-                    np.array([x[i, j], y[i, j], z[i, j]]) + \
-                    np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]])
-
-                    Q[k] = S/3
-
-                    a = norm(np.array([x[i, j-1], y[i,j-1],z[i,j-1]])-np.array([x[i, j], y[i, j], z[i, j]]))
-                    b = norm(np.array([x[i, j], y[i,j],z[i,j]])-np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]]))
-                    c = norm(np.array([x[i-1, j-1], y[i-1, j-1], z[i-1, j-1]])-np.array([x[i, j-1], y[i, j-1], z[i, j-1]]))
-                    s = a+b+c
-                    s = s/2
-
-                    A[k] = np.sqrt(s*(s-a)*(s-b)*(s-c))
-                    k += 1
-
-            for i in np.arange(2,n):
-                S = np.array([x[i, 0], y[i, 0], z[i, 0]])+np.array([x[i-1, 0], y[i-1, 0], z[i-1, 0]])+np.array([x[i-1, -2], y[i-1, -2], z[i-1, -2]])
-                Q[k] = S/3
-
-                a = norm(np.array([x[i, 0], y[i, 0], z[i, 0]])-np.array([x[i-1, 0], y[i-1, 0], z[i-1, 0]]))
-                b = norm(np.array([x[i-1, 0], y[i-1, 0], z[i-1, 0]])-np.array([x[i-1, -2], y[i-1, -2], z[i-1, -2]]))
-                c = norm(np.array([x[i-1, -2], y[i-1, -2], z[i-1, -2]])-np.array([x[i, 0], y[i, 0], z[i, 0]]))
-                s = a+b+c
-                s = s/2
-
-                A[k] = np.sqrt(s*(s-a)*(s-b)*(s-c))
-                k += 1
-
-            for i in np.arange(1,n-1):
-                S = np.array([x[i, -2], y[i, -2], z[i, -2]])+np.array([x[i, 0], y[i, 0], z[i, 0]])+np.array([x[i-1, -2], y[i-1, -2], z[i-1, -2]])
-                Q[k] = S/3
-
-                a = norm(np.array([x[i, -2], y[i, -2], z[i, -2]]) - np.array([x[i,0], y[i,0], z[i, 0]]))
-                b = norm(np.array([x[i, 0], y[i, 0], z[i, 0]]) - np.array([x[i-1,-2], y[i-1, -2], z[i-1, -2]]))
-                c = norm(np.array([x[i-1, -2], y[i-1, -2], z[i-1, -2]]) - np.array([x[i, -2], y[i, -2], z[i, -2]]))
-                s = a+b+c
-                s = s/2
-
-                A[k] = np.sqrt(s*(s-a)*(s-b)*(s-c))
-                k += 1
-
-            qx = kpoint[0,u] - Q[:,0]
-            qy = kpoint[1,u] - Q[:,1]
-            qz = kpoint[2,u] - Q[:,2]
-            q = np.sqrt(qx**2+qy**2+qz**2)
-
-            cosTheta = np.matmul(kpoint[:,u][None,:],Q.T)/norm(kpoint[:,u])/np.sqrt(np.sum(Q**2,axis=1))
-
-            delE = np.abs(thermoelectricProperties.hBar**2*((Q[:, 0]-ko[0])/meff[0]+(Q[:,1]-ko[1])/meff[1]+(Q[:,2]-ko[2])/meff[2]))
-
-            for ro_idx in np.arange(len(ro)):
-                M = 4*np.pi*Uo*(1/q*np.sin(ro[ro_idx]*q)-ro[ro_idx]*np.cos(ro[ro_idx]*q))/(q**2)        # Matrix element
-                SR = 2*np.pi/thermoelectricProperties.hBar*M*np.conj(M)                                 # Scattering rate
-                f = SR/delE*(1-cosTheta)
-                scattering_rate[ro_idx,u] = N[ro_idx]/(2*np.pi)**3*np.sum(f*A.T)
+
+        axes_coef = np.sqrt(2 / (thermoelectricProperties.hBar**2 * thermoelectricProperties.e2C) * E)   # Ellipsoid axes for every energy at once
+        a_axes = np.sqrt(meff[0]) * axes_coef
+        b_axes = np.sqrt(meff[1]) * axes_coef
+        c_axes = np.sqrt(meff[2]) * axes_coef
+
+        # dtype=np.float32 halves the footprint of the triangulated surfaces; the
+        # accumulated scattering rate stays float64
+        x_ = x_.astype(dtype, copy=False)
+        y_ = y_.astype(dtype, copy=False)
+        z_ = z_.astype(dtype, copy=False)
+        a_axes = a_axes.astype(dtype, copy=False)
+        b_axes = b_axes.astype(dtype, copy=False)
+        c_axes = c_axes.astype(dtype, copy=False)
+        ko = ko.astype(dtype, copy=False)
+
+        # Mesh unit energy ellipsiod in triangular elements. Each energy surface is the
+        # componentwise affine image scale_u * vertex + ko of the unit sphere, and
+        # centroids and edge cross products transform with the map, so the triangulation
+        # is built once instead of per energy level
+
+        z = np.tile(z_[:, None], (1,n))
+
+        X = np.stack((x_, y_, z), axis=-1)      # Unit-sphere vertex coordinates, [n, n, 3]
+
+        # The four triangle families of the surface mesh as slice views: the two
+        # interior families and the two seam families closing the parametrization
+        vertexBlocks = [
+            (X[2:, 1:-1], X[1:-1, 1:-1], X[1:-1, :-2]),
+            (X[1:-1, :-2], X[1:-1, 1:-1], X[:-2, :-2]),
+            (X[2:, 0], X[1:-1, 0], X[1:-1, -2]),
+            (X[1:-1, -2], X[1:-1, 0], X[:-2, -2]),
+        ]
+
+        # Assembly plan known a priori: the two interior families carry (n-2)^2 elements
+        # each and the two seam families n-2, so each family writes straight into its
+        # slice of the preallocated component arrays (structure of arrays, so the
+        # scattering kernel reads unit-stride memory)
+        blockSizes = ((n-2)*(n-2), (n-2)*(n-2), n-2, n-2)
+        numTri = sum(blockSizes)
+        Qux = np.empty(numTri, dtype=dtype)     # Unit-sphere element centroids
+        Quy = np.empty(numTri, dtype=dtype)
+        Quz = np.empty(numTri, dtype=dtype)
+        Cux = np.empty(numTri, dtype=dtype)     # Edge cross products, half the magnitude is the element area
+        Cuy = np.empty(numTri, dtype=dtype)
+        Cuz = np.empty(numTri, dtype=dtype)
+
+        start = 0
+        for (V0, V1, V2), size in zip(vertexBlocks, blockSizes):
+            stop = start + size
+            # Slice reshapes copy into contiguous [numTri, 3] blocks for the jitted builder
+            _tau3D_mesh_block(V0.reshape(-1, 3), V1.reshape(-1, 3), V2.reshape(-1, 3),
+                              Qux[start:stop], Quy[start:stop], Quz[start:stop],
+                              Cux[start:stop], Cuy[start:stop], Cuz[start:stop])
+            start = stop
+
+        # Loop-invariant scalars hoisted once: prefactors, the hBar^2 of the energy
+        # denominator and the per-radius weight of the final sum
+        SR_coef = 2*np.pi/thermoelectricProperties.hBar         # Golden-rule prefactor
+        four_pi_Uo = 4*np.pi*Uo
+        hBar2 = thermoelectricProperties.hBar**2
+        N_coef = N/(2*np.pi)**3
+
+        # The k points and radii follow the requested dtype as well, so the whole
+        # geometry side of the kernel runs in float32 when asked; the accumulators and
+        # the returned rates stay float64 inside the kernel
+        scattering_rate = _tau3D_scatter_kernel(Qux, Quy, Quz, Cux, Cuy, Cuz,
+                                                mesh.kx.astype(dtype, copy=False),
+                                                mesh.ky.astype(dtype, copy=False),
+                                                mesh.kz.astype(dtype, copy=False),
+                                                mag_kpoint.astype(dtype, copy=False),
+                                                a_axes, b_axes, c_axes,
+                                                ko[0], ko[1], ko[2], meff[0], meff[1], meff[2],
+                                                ro.astype(dtype, copy=False),
+                                                N_coef, four_pi_Uo, SR_coef, hBar2)
 
         return scattering_rate          # Electorn scattering rate from the spherical pores/ nanoparticles
 
@@ -696,19 +899,30 @@ class thermoelectricProperties:
         Y = (E - np.transpose(Ef)) * X  # Gamma
         Z = (E - np.transpose(Ef)) * Y  # Zeta
 
-        Sigma = -1 * np.trapz(X * tau, E, axis=1) / 3 * thermoelectricProperties.e2C            # Electrical conductivity
-        S = -1*np.trapz(Y * tau, E, axis=1)/np.trapz(X * tau, E, axis=1)/Temp                   # Thermopower
+        # The five moments share the same integrands, so each product and each integral
+        # is formed once and reused instead of being rebuilt per coefficient
+        Xt = X * tau
+        Yt = Y * tau
+        Zt = Z * tau
+        # Any leading batch axes are flattened for the fused integrator and restored on
+        # the outputs, so batched lifetime stacks broadcast through unchanged
+        lead = Xt.shape[:-1]
+        moments = _fused_moments(Xt.reshape(-1, Xt.shape[-1]), Yt.reshape(-1, Yt.shape[-1]),
+                                 Zt.reshape(-1, Zt.shape[-1]), E[0])
+        I_X, I_Y, I_Z, I_XE, I_XE2 = moments.reshape((5,) + lead)
+
+        Sigma = -1 * I_X / 3 * thermoelectricProperties.e2C                                     # Electrical conductivity
+        S = -1*I_Y/I_X/Temp[0]                                                                  # Thermopower
         PF = Sigma*S**2                                                                         # Power factor
-        ke = -1*(np.trapz(Z * tau, E, axis=1) - np.trapz(Y * tau, E, axis=1)**2 /
-                 np.trapz(X * tau, E, axis=1))/Temp/3 * thermoelectricProperties.e2C            # Electron thermal conductivity
+        ke = -1*(I_Z - I_Y**2/I_X)/Temp[0]/3 * thermoelectricProperties.e2C                     # Electron thermal conductivity
 
-        delta_0 = np.trapz(X * tau* E, E, axis=1)                                              
-        delta_1 = np.trapz(X * tau* E, E, axis=1) / np.trapz(X * tau, E, axis=1)                # First moment of current
-        delta_2 = np.trapz(X * tau* E**2, E, axis=1) / np.trapz(X * tau, E, axis=1)             # Second moment of current
+        delta_0 = I_XE
+        delta_1 = I_XE / I_X                                                                    # First moment of current
+        delta_2 = I_XE2 / I_X                                                                   # Second moment of current
 
-        Lorenz = (delta_2-delta_1**2)/Temp/Temp                                                 # Lorenz number
+        Lorenz = (delta_2-delta_1**2)/Temp[0]/Temp[0]                                           # Lorenz number
 
-        coefficients = [Sigma, S[0], PF[0], ke[0], delta_1, delta_2, Lorenz[0]]
+        coefficients = [Sigma, S, PF, ke, delta_1, delta_2, Lorenz]
 
         return coefficients  # The list is 7 by numEnergySampling
 
@@ -720,24 +934,23 @@ class thermoelectricProperties:
         where all the electrons up to a cutoff energy level of U are completely filtered
         """
 
-        tauUo = np.ones(len(E[0]))
-        _Conductivity = [np.empty([1, len(tau_b)])]
-        _Seebeck = [np.empty([1, len(tau_b)])]
+        # One lifetime buffer reset in place per cutoff instead of a fresh copy.copy each pass
+        tau_idl = np.ones(len(E[0]))
+        # Outputs preallocated at their final [len(U), numTemp] shape, the append-in-loop
+        # pattern recopied the whole accumulated array on every iteration
+        Conductivity = np.empty((len(U), np.shape(Temp)[1]))                    # Electrical conductivity
+        Seebeck = np.empty((len(U), np.shape(Temp)[1]))                         # Thermopower
+        # energyRange is sorted, so each cutoff mask is a prefix found by bisection
+        # instead of a full O(nE) comparison plus boolean indexing per iteration
+        cuts = np.searchsorted(E[0], U)
         for i in np.arange(len(U)):
-            tau_idl = copy.copy(tauUo)
-            tau_idl[E[0]<U[i]] = 0
+            np.copyto(tau_idl, 1.)
+            tau_idl[:cuts[i]] = 0
             tau = self.matthiessen(E, tau_idl, tau_b)
             coefficients = self.electricalProperties(E=E, DoS=DoS,
                                                      vg=vg, Ef=Ef, dfdE=dfdE, Temp=Temp, tau=tau)
-            Sigma = np.expand_dims(coefficients[0], axis=0)                     # Electrical conductivity
-            S = np.expand_dims(coefficients[1], axis=0)                         # Thermopower
-
-            _Conductivity = np.append(_Conductivity, [Sigma], axis=0)
-            _Seebeck = np.append(_Seebeck, [S], axis=0)
-            del tau_idl
-
-        Conductivity = np.delete(_Conductivity, 0, axis = 0)
-        Seebeck = np.delete(_Seebeck, 0, axis = 0)
+            Conductivity[i] = coefficients[0]
+            Seebeck[i] = coefficients[1]
 
         return [Conductivity, Seebeck]  # The list is 2 by numEnergySampling
 
@@ -749,25 +962,18 @@ class thermoelectricProperties:
         See manual for the detail.
         """
 
-        tauU = np.ones(len(E[0]))
-        _Conductivity = [np.empty([1, 1])]
-        _Seebeck = [np.empty([1, 1])]
-        for _j in np.arange(len(tauo)):
-            for _i in np.arange(len(U)):
-                tau_ph = copy.copy(tauU)
-                tau_ph[E[0]<U[_i]] = tauo[_j]
-                tau = self.matthiessen(E, tau_ph, tau_b)
-                coefficients = self.electricalProperties(E=E, DoS=DoS,
-                                                         vg=vg, Ef=Ef, dfdE=dfdE, Temp=Temp, tau=tau)
-                Sigma = np.expand_dims(coefficients[0], axis=0)
-                S = np.expand_dims(coefficients[1], axis=0)
-                _Conductivity = np.append(_Conductivity, [Sigma], axis=0)
-                _Seebeck = np.append(_Seebeck, [S], axis=0)
-                del tau_ph
-
-        __Conductivity = np.delete(_Conductivity, 0, axis = 0)
-        __Seebeck = np.delete(_Seebeck, 0, axis = 0)
-        Conductivity = np.reshape(__Conductivity,(len(tauo),len(U)))             # Electrical conductivity
-        Seebeck = np.reshape(__Seebeck, (len(tauo), len(U)))                     # Thermopower
+        # The whole (tauo, U) sweep is evaluated in one batched electricalProperties call:
+        # every lifetime variant is a row of one stack, so the Python loop, its per-variant
+        # matthiessen calls and the per-variant integration all collapse into single passes
+        # energyRange is sorted, so each cutoff mask is a prefix found by bisection
+        cuts = np.searchsorted(E[0], U)
+        tau_stack = np.ones((len(tauo), len(U), np.shape(E)[1]))
+        for _i in np.arange(len(U)):
+            tau_stack[:, _i, :cuts[_i]] = tauo[:, None]
+        tau = self.matthiessen(E, tau_stack.reshape(-1, 1, np.shape(E)[1]), tau_b)
+        coefficients = self.electricalProperties(E=E, DoS=DoS,
+                                                 vg=vg, Ef=Ef, dfdE=dfdE, Temp=Temp, tau=tau)
+        Conductivity = coefficients[0].reshape(len(tauo), len(U))                # Electrical conductivity
+        Seebeck = coefficients[1].reshape(len(tauo), len(U))                     # Thermopower
 
         return [Conductivity, Seebeck]  # The list is 2 by numEnergySampling